@@ -2,24 +2,95 @@
 Module for appending scraped articles to a Google Sheet.
 """
 
+import json
+import logging
+import mmap
 import os
+import re
 import sys
-import requests
+import time
+from itertools import chain
+import orjson
 from dotenv import load_dotenv
+from http_session import create_session
 
+logger = logging.getLogger(__name__)
 
-def get_access_token(jwt_filename="jwt.txt"):
+# Load the .env file into os.environ once, when the module is first imported.
+load_dotenv()
+
+SPREADSHEET_SHEET_NAME = os.getenv("SPREADSHEET_SHEET_NAME")
+SPREADSHEET_CELL_RANGE = os.getenv("SPREADSHEET_CELL_RANGE")
+SPREADSHEET_ID = os.getenv("SPREADSHEET_ID")
+
+# Shared session so the token exchange and the Sheets append reuse the
+# same TLS connection to *.googleapis.com.
+_SESSION = create_session()
+
+# Matches either a block separator or a "Title:"/"Link:" line, which may be
+# indented, in the file written by article_scraper.save_articles.
+_ARTICLE_RE = re.compile(
+    rb"(?P<sep>-{40})|^[^\S\n]*(?P<key>Title|Link):(?P<value>[^\n]*)",
+    re.MULTILINE)
+
+# Seconds before expiry at which a cached access token is no longer reused.
+TOKEN_EXPIRY_MARGIN = 60
+
+
+class TokenRejectedError(RuntimeError):
+    """Raised when Google Sheets rejects the access token (HTTP 401 or 403)."""
+
+
+def _load_cached_token(cache_filename):
+    """
+    Returns the access token stored in cache_filename, or None if the cache
+    is missing, unreadable, or about to expire.
+    """
+    try:
+        with open(cache_filename, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+        if time.time() < cache["exp"] - TOKEN_EXPIRY_MARGIN:
+            return cache["access_token"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+
+def _save_cached_token(cache_filename, access_token, expires_in):
+    """Stores the access token and its absolute expiry time in cache_filename."""
+    try:
+        with open(cache_filename, "w", encoding="utf-8") as f:
+            json.dump({"access_token": access_token,
+                       "exp": time.time() + expires_in}, f)
+    except OSError as e:
+        logger.warning("Could not cache access token: %s", e)
+
+
+def get_access_token(jwt_filename="jwt.txt", cache_filename="token_cache.json",
+                     refresh=False):
     """
     Reads a JWT from file and exchanges it for an access token.
 
+    A previously obtained token cached in cache_filename is returned instead,
+    without reading the JWT, while it remains valid. With refresh=True the
+    cache is deleted first and a new token is always exchanged.
+
     Returns:
         str: The obtained access token.
 
     Raises:
         RuntimeError: If the JWT cannot be read or the token exchange fails.
     """
-    # Loads environment variables from the .env file into os.environ
-    load_dotenv()
+    if refresh:
+        try:
+            os.remove(cache_filename)
+        except FileNotFoundError:
+            pass
+    else:
+        access_token = _load_cached_token(cache_filename)
+        if access_token:
+            print("Using cached Access Token.")
+            return access_token
 
     # Read your JWT token from a file called "jwt.txt".
     print("Reading JWT token from file ...")
@@ -44,7 +115,7 @@ def get_access_token(jwt_filename="jwt.txt"):
 
     # Send the POST request to obtain an access token.
     print("Exchanging JWT for Access Token ...")
-    token_response = requests.post(
+    token_response = _SESSION.post(
         token_url,
         data=token_payload,
         headers=token_headers,
@@ -54,18 +125,48 @@ def get_access_token(jwt_filename="jwt.txt"):
         raise RuntimeError(error_msg)
 
     # Extract the access token.
-    access_token = token_response.json().get("access_token")
+    token_data = orjson.loads(token_response.content)
+    access_token = token_data.get("access_token")
     if not access_token:
         raise RuntimeError("Access token not found in the response.")
 
+    _save_cached_token(
+        cache_filename, access_token, token_data.get("expires_in", 3600))
     print("Successfully obtained Access Token.")
     return access_token
 
 
+def _parse_articles(buf):
+    """
+    Scans buf with a single precompiled regex and returns a row for every
+    block that has both a title and a link, in either order. If a block
+    repeats a key, the last value wins.
+    """
+    articles = []
+    fields = {}
+    # A final None flushes the last block, which has no trailing separator.
+    for match in chain(_ARTICLE_RE.finditer(buf), (None,)):
+        if match is None or match.group("sep"):
+            title = fields.get(b"Title")
+            link = fields.get(b"Link")
+            # If both title and link are found, build a row.
+            if title and link:
+                # To force insertion into columns C and D,
+                # include two empty strings for columns A and B.
+                articles.append(["", "", link, title])
+            fields = {}
+        else:
+            fields[match.group("key")] = match.group("value").decode("utf-8").strip()
+    return articles
+
+
 def load_articles(file_path="articles.txt"):
     """
     Reads articles from a file and parses them into a list.
 
+    The file is memory-mapped and scanned in place by a precompiled regex,
+    so only the title and link values are ever copied out of it.
+
     Returns:
         list: A list of rows where each row is formatted as ["", "", link, title].
               If no articles are found, the list is empty.
@@ -76,33 +177,14 @@ def load_articles(file_path="articles.txt"):
     articles = []
 
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read()
+        with open(file_path, "rb") as f:
+            # An empty file cannot be memory-mapped.
+            if os.fstat(f.fileno()).st_size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    articles = _parse_articles(mm)
     except Exception as e:
         raise RuntimeError(f"Error reading {file_path}: {e}") from e
 
-    # Split into blocks based on the dashed separator.
-    blocks = content.split("----------------------------------------")
-    for block in blocks:
-        block = block.strip()
-        if not block:
-            continue
-
-        title = None
-        link = None
-        # Process each line in the block.
-        for line in block.splitlines():
-            line = line.strip()
-            if line.startswith("Title:"):
-                title = line[len("Title:"):].strip()
-            elif line.startswith("Link:"):
-                link = line[len("Link:"):].strip()
-        # If both title and link are found, build a row.
-        if title and link:
-            # To force insertion into columns C and D,
-            # include two empty strings for columns A and B.
-            articles.append(["", "", link, title])
-
     if not articles:
         print("No articles found to append.")
     else:
@@ -115,6 +197,10 @@ def append_articles(articles, access_token):
     """
     Appends the given articles to the Google Sheet.
 
+    All rows are sent in a single append request, so callers should
+    accumulate every article first rather than calling this per site or
+    per article, which would quickly exhaust the Sheets write quota.
+
     Args:
         articles (list): List of articles formatted as rows.
         access_token (str): OAuth 2.0 access token.
@@ -123,21 +209,23 @@ def append_articles(articles, access_token):
         dict: The JSON response from the Sheets API.
 
     Raises:
+        TypeError: If articles is not a list of rows.
+        TokenRejectedError: If the access token is rejected.
         RuntimeError: If appending the data fails.
     """
-    sheet_name = os.getenv("SPREADSHEET_SHEET_NAME")
-    cell_range = os.getenv("SPREADSHEET_CELL_RANGE")
-    spreadsheet_id = os.getenv("SPREADSHEET_ID")
+    if not isinstance(articles, list) or not all(
+            isinstance(row, list) for row in articles):
+        raise TypeError("articles must be a single list of rows.")
 
-    if not (sheet_name and cell_range and spreadsheet_id):
+    if not (SPREADSHEET_SHEET_NAME and SPREADSHEET_CELL_RANGE and SPREADSHEET_ID):
         raise RuntimeError(
             "Missing one or more required env variables: "
             "SPREADSHEET_SHEET_NAME, SPREADSHEET_CELL_RANGE, SPREADSHEET_ID.")
 
     # Build the URL.
-    range_name = f"{sheet_name}!{cell_range}"
+    range_name = f"{SPREADSHEET_SHEET_NAME}!{SPREADSHEET_CELL_RANGE}"
     append_url = (
-        f"https://sheets.googleapis.com/v4/spreadsheets/{spreadsheet_id}"
+        f"https://sheets.googleapis.com/v4/spreadsheets/{SPREADSHEET_ID}"
         f"/values/{range_name}:append?valueInputOption=USER_ENTERED"
     )
 
@@ -147,32 +235,48 @@ def append_articles(articles, access_token):
         "Content-Type": "application/json"
     }
 
-    # Build the request body.
-    body = {"values": articles}
+    # Build the request body, serialized up front with orjson.
+    body = orjson.dumps({"values": articles})
 
     # Send the append POST request.
     print("Appending data to Google Sheets ...")
-    append_response = requests.post(
-        append_url, headers=sheets_headers, json=body, timeout=10
+    append_response = _SESSION.post(
+        append_url, headers=sheets_headers, data=body, timeout=10
     )
+    if append_response.status_code in (401, 403):
+        raise TokenRejectedError(
+            f"Access token rejected by Google Sheets: {append_response.text}")
     if append_response.status_code != 200:
         error_msg = f"Error appending data to Google Sheets: {append_response.text}"
         raise RuntimeError(error_msg)
 
     print("Successfully appended data to Google Sheets.")
-    return append_response.json()
+    return orjson.loads(append_response.content)
 
 
-def run_append_articles():
+def run_append_articles(access_token=None):
     """
     Runs the complete process: obtains an access token, loads articles from file,
     and appends them to Google Sheets.
+
+    If Google Sheets rejects the token, for example because it was cached
+    for revoked or different credentials, a new token is exchanged and the
+    append is retried once.
+
+    Args:
+        access_token (str): An already obtained access token. If omitted, one
+            is obtained with get_access_token().
     """
-    access_token = get_access_token()
+    if access_token is None:
+        access_token = get_access_token()
     articles = load_articles()
-    if articles:
+    if not articles:
+        return None
+    try:
         return append_articles(articles, access_token)
-    return None
+    except TokenRejectedError as e:
+        logger.warning("%s; retrying with a new access token.", e)
+        return append_articles(articles, get_access_token(refresh=True))
 
 
 def main():
@@ -188,4 +292,5 @@ def main():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     main()
@@ -4,41 +4,161 @@ Module for scraping articles from various websites.
 
 import sys
 import abc
-from datetime import datetime
+import io
+import logging
+from contextlib import closing
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import date, datetime
 import requests
-from bs4 import BeautifulSoup
+import requests_cache
+import urllib3
+import lxml.html
+from lxml import etree
+from http_session import create_session
 
+logger = logging.getLogger(__name__)
 
+# Default headers sent with every scraper request.
+_HEADERS = {
+    "User-Agent": ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                   "AppleWebKit/537.36 (KHTML, like Gecko) "
+                   "Chrome/85.0.4183.102 Safari/537.36")
+}
+
+# Shared session so repeated requests to the same host reuse connections.
+# Listing pages are cached on disk so reruns skip unchanged downloads.
+_SESSION = create_session(_HEADERS, cache_name="scrape_cache.sqlite")
+
+
+# Line written after every article in the output file.
+_SEPARATOR = "-" * 40 + "\n"
+
+
+def _has_class(name):
+    """Returns an XPath predicate matching elements that carry the CSS class name."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# XPath expressions are compiled once and evaluated in C for every page.
+_IN_BETAKIT_SECTION = etree.XPath(
+    f"boolean(ancestor::section[{_has_class('section__latest-posts')}])")
+_BETAKIT_DATE = etree.XPath(
+    f"string((.//span[{_has_class('entry-date')}])[1])")
+_BETAKIT_TITLE_LINK = etree.XPath(
+    f"(.//h2[{_has_class('entry-title')}])[1]/descendant::a[1]")
+
+_IS_FINSMES_POST = etree.XPath(
+    f"boolean(self::div[{_has_class('td-cpt-post')}])")
+_FINSMES_MODULE_CONTAINER = etree.XPath(
+    f"(.//div[{_has_class('td-module-container')}])[1]")
+_FINSMES_TIME = etree.XPath(
+    f"(.//time[{_has_class('entry-date')}])[1]")
+_FINSMES_TITLE_LINK = etree.XPath(
+    f"(.//h3[{_has_class('entry-title')}])[1]/descendant::a[1]")
+
+
+_MONTHS = {
+    name: number for number, name in enumerate((
+        "January", "February", "March", "April", "May", "June", "July",
+        "August", "September", "October", "November", "December"), start=1)
+}
+
+
+def _parse_human_date(date_text):
+    """
+    Parses a date such as "April 14, 2025" into a date.
+
+    Splits on a month-name lookup table and only falls back to strptime
+    (which re-parses its format on every call) when that fails.
+
+    Raises:
+        ValueError: If date_text is not a valid date in that format.
+    """
+    try:
+        month, day, year = date_text.replace(",", " ").split()
+        return date(int(year), _MONTHS[month], int(day))
+    except (KeyError, ValueError):
+        return datetime.strptime(date_text, "%B %d, %Y").date()
+
+
+def _declared_encoding(response):
+    """
+    Returns the charset explicitly declared in the response's Content-Type
+    header, or None. response.encoding alone is not used because it falls
+    back to ISO-8859-1 for any text/* response without a charset. A charset
+    lxml does not know (e.g. utf8mb4) also gives None, so the page's own
+    <meta charset> is used instead of the parse failing.
+    """
+    if "charset" not in response.headers.get("Content-Type", "").lower():
+        return None
+    try:
+        # lxml knows fewer names than Python's codecs, so ask lxml itself.
+        etree.HTMLParser(encoding=response.encoding)
+    except LookupError:
+        return None
+    return response.encoding
+
+
+def _title_and_link(a_tags):
+    """Returns (title, link) from the first matched <a> element, if any."""
+    if not a_tags:
+        return "No Title", ""
+    a_tag = a_tags[0]
+    return "".join(a_tag.itertext()).strip(), a_tag.get("href", "")
+
+
+@dataclass(frozen=True)
 class Article:
     """
     Represents an article with a title, link, and publication date.
-    """
 
-    def __init__(self, title, link, date):
-        """
-        Initializes an Article instance.
-        Args:
-            title (str): The title of the article.
-            link (str): The URL link to the article.
-            date (datetime): The publication date of the article.
-        """
-        self.title = title
-        self.link = link
-        self.date = date  # Expected to be a naive datetime
+    Attributes:
+        title (str): The title of the article.
+        link (str): The URL link to the article.
+        date (date): The publication date of the article.
+    """
+    # Declared explicitly because dataclass(slots=True) needs Python 3.10.
+    # _date_str is not a dataclass field: it caches the "YYYY-MM-DD" form of
+    # date, formatted once and exposed through date_str.
+    __slots__ = ("title", "link", "date", "_date_str")
+
+    title: str
+    link: str
+    date: date
+
+    def __post_init__(self):
+        # The dataclass is frozen, so bypass its __setattr__.
+        object.__setattr__(self, "_date_str", self.date.isoformat())
+
+    def __getstate__(self):
+        # Hand-written __slots__ leave copy and pickle to restore state with
+        # setattr, which a frozen dataclass rejects; dataclass(slots=True)
+        # adds these two methods for the same reason.
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
+    @property
+    def date_str(self):
+        """The publication date formatted as YYYY-MM-DD."""
+        return self._date_str  # pylint: disable=no-member
 
     def to_dict(self):
         """Returns a dictionary representation of the article with a formatted date."""
         return {
             "title": self.title,
             "link": self.link,
-            "date": self.date.strftime("%Y-%m-%d")
+            "date": self.date_str
         }
 
     def __repr__(self):
         return (
         f"Article(title='{self.title}', "
         f"link='{self.link}', "
-        f"date='{self.date.strftime('%Y-%m-%d')}')"
+        f"date='{self.date_str}')"
     )
 
 
@@ -49,25 +169,93 @@ class BaseScraper(abc.ABC):
 
     def __init__(self, url):
         self.url = url
+        self.session = _SESSION
+        # Charset declared by the last response's Content-Type header, if any.
+        self.encoding = None
 
     def fetch_html(self):
         """
         Fetch HTML content from self.url using a custom User-Agent.
         A timeout of 10 seconds is specified to avoid hanging indefinitely.
+
+        Returns the raw response bytes, which are never decoded into a str
+        here, or None if the request failed.
         """
-        headers = {
-            "User-Agent": ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                           "AppleWebKit/537.36 (KHTML, like Gecko) "
-                           "Chrome/85.0.4183.102 Safari/537.36")
-        }
         try:
-            response = requests.get(self.url, headers=headers, timeout=10)
+            response = self.session.get(self.url, timeout=10)
             response.raise_for_status()
-            return response.text
+            self.encoding = _declared_encoding(response)
+            return response.content
         except requests.RequestException as e:
-            print(f"Error fetching {self.url}: {e}")
+            logger.warning("Error fetching %s: %s", self.url, e)
             return None
 
+    def stream_elements(self, tag, match=None):
+        """
+        Streams the page at self.url through lxml's incremental parser.
+
+        Returns an iterator that yields each <tag> element for which match
+        (a compiled boolean XPath, or None to accept all) is true, as soon as
+        its end tag has been parsed, with all of its descendants. Once the
+        caller moves on, the yielded element is cleared and its earlier
+        siblings are removed from the tree. Nothing else is freed: unmatched
+        elements elsewhere in the page stay in the tree until parsing ends,
+        so memory is only bounded when the matches are siblings of one
+        another, as with a listing of posts. Closing the iterator early (for
+        example by breaking out of a loop wrapped in contextlib.closing)
+        stops parsing. With a plain session it also stops reading from the
+        socket; a cached session (requests_cache.CachedSession) has already
+        downloaded and decoded the whole body on a cache miss, so the page
+        is parsed from memory instead. Returns None if the request failed.
+        """
+        try:
+            response = self.session.get(self.url, timeout=10, stream=True)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            logger.warning("Error fetching %s: %s", self.url, e)
+            return None
+        self.encoding = _declared_encoding(response)
+        return self._iter_elements(response, tag, match)
+
+    def _iter_elements(self, response, tag, match):
+        """Yields <tag> elements from a streamed response; see stream_elements."""
+        with response:
+            if isinstance(self.session, requests_cache.CachedSession):
+                # The cache has already read and decoded the body, so the
+                # raw stream can no longer be parsed.
+                source = io.BytesIO(response.content)
+            else:
+                # Let urllib3 undo any gzip/deflate transfer encoding.
+                response.raw.decode_content = True
+                source = response.raw
+            try:
+                for _, elem in etree.iterparse(
+                        source, events=("end",), tag=tag, html=True,
+                        encoding=self.encoding):
+                    # Unmatched elements are left intact, since they may be
+                    # descendants of an element that is yet to match.
+                    if match is not None and not match(elem):
+                        continue
+                    yield elem
+                    elem.clear()
+                    while elem.getprevious() is not None:
+                        del elem.getparent()[0]
+            except urllib3.exceptions.HTTPError as e:
+                logger.warning("Error reading %s: %s", self.url, e)
+
+    def parse_html(self, html):
+        """
+        Parses the bytes returned by fetch_html into an lxml document.
+
+        The parser decodes the bytes itself, using the charset from the
+        response headers when one was declared and the page's <meta charset>
+        otherwise.
+        """
+        parser = None
+        if self.encoding:
+            parser = lxml.html.HTMLParser(encoding=self.encoding)
+        return lxml.html.document_fromstring(html, parser=parser)
+
     @abc.abstractmethod
     def scrape(self, threshold_date):
         """
@@ -77,7 +265,7 @@ class BaseScraper(abc.ABC):
         Must be implemented by each subclass.
 
         Args:
-            threshold_date (datetime): Only articles on/after this date are returned.
+            threshold_date (date): Only articles on/after this date are returned.
         """
         raise NotImplementedError
 
@@ -86,49 +274,46 @@ class BetaKitScraper(BaseScraper):
     """
     Scraper for the BetaKit website.
     """
-    def parse_article(self, article_elem):
-        """Parses a single BetaKit <article> element and returns an Article instance."""
-        date_elem = article_elem.find("span", class_="entry-date")
-        if not date_elem:
+    def parse_date(self, article_elem):
+        """Returns the publication date of a BetaKit <article> element, or None."""
+        date_text = _BETAKIT_DATE(article_elem).strip()  # e.g., "April 14, 2025"
+        if not date_text:
             return None
 
-        date_text = date_elem.get_text(strip=True)  # e.g., "April 14, 2025"
         try:
-            art_date = datetime.strptime(date_text, '%B %d, %Y')
+            return _parse_human_date(date_text)
         except ValueError:
             return None
 
-        title_elem = article_elem.find("h2", class_="entry-title")
-        if title_elem:
-            a_tag = title_elem.find("a")
-            if a_tag:
-                title = a_tag.get_text(strip=True)
-                link = a_tag.get("href", "")
-            else:
-                title, link = "No Title", ""
-        else:
-            title, link = "No Title", ""
-
+    def parse_article(self, article_elem, art_date):
+        """Builds an Article instance from a BetaKit <article> element dated art_date."""
+        title, link = _title_and_link(_BETAKIT_TITLE_LINK(article_elem))
         return Article(title, link, art_date)
 
     def scrape(self, threshold_date):
         """Fetch and parse BetaKit articles, returning those on/after threshold_date."""
-        html = self.fetch_html()
-        if html is None:
-            return []
-
-        soup = BeautifulSoup(html, "html.parser")
-        section = soup.find("section", class_="section__latest-posts")
-        if not section:
-            print("BetaKit: 'Latest' section not found.")
+        article_elems = self.stream_elements("article", _IN_BETAKIT_SECTION)
+        if article_elems is None:
             return []
 
         articles = []
-        for article_elem in section.find_all("article"):
-            article = self.parse_article(article_elem)
-            if article is not None and article.date >= threshold_date:
-                articles.append(article)
-
+        found_section = False
+        with closing(article_elems):
+            for article_elem in article_elems:
+                found_section = True
+
+                art_date = self.parse_date(article_elem)
+                if art_date is None:
+                    continue
+                # The 'Latest' section is sorted newest first, so no later
+                # article can be on/after threshold_date either; stop
+                # parsing the rest of the page.
+                if art_date < threshold_date:
+                    break
+                articles.append(self.parse_article(article_elem, art_date))
+
+        if not found_section:
+            logger.warning("BetaKit: 'Latest' section not found.")
         return articles
 
 
@@ -136,83 +321,86 @@ class FinSMEsScraper(BaseScraper):
     """
     Scraper for the FinSMEs website.
     """
-    def parse_article(self, article_elem):
-        """Parses a single FinSMEs article container and returns an Article instance."""
-        time_elem = article_elem.find("time", class_="entry-date")
-        if not time_elem:
+    def parse_date(self, article_elem):
+        """Returns the publication date of a FinSMEs article container, or None."""
+        time_elems = _FINSMES_TIME(article_elem)
+        if not time_elems:
             return None
+        time_elem = time_elems[0]
 
         datetime_attr = time_elem.get("datetime", "").strip()
         if not datetime_attr:
             return None
         try:
-            art_date = datetime.fromisoformat(datetime_attr)
-            art_date = art_date.replace(tzinfo=None)
+            # Only the day matters, so parse just the YYYY-MM-DD prefix and
+            # skip the time and UTC offset entirely.
+            return date.fromisoformat(datetime_attr[:10])
         except ValueError:
-            date_text = time_elem.get_text(strip=True)
+            date_text = "".join(time_elem.itertext()).strip()
             try:
-                art_date = datetime.strptime(date_text, "%B %d, %Y")
+                return _parse_human_date(date_text)
             except ValueError:
                 return None
 
-        title_elem = article_elem.find("h3", class_="entry-title")
-        if title_elem:
-            a_tag = title_elem.find("a")
-            if a_tag:
-                title = a_tag.get_text(strip=True)
-                link = a_tag.get("href", "")
-            else:
-                title, link = "No Title", ""
-        else:
-            title, link = "No Title", ""
-
+    def parse_article(self, article_elem, art_date):
+        """Builds an Article instance from a FinSMEs article container dated art_date."""
+        title, link = _title_and_link(_FINSMES_TITLE_LINK(article_elem))
         return Article(title, link, art_date)
 
     def scrape(self, threshold_date):
         """
         Fetch and parse FinSMEs articles, filtering by threshold_date.
         """
-        html = self.fetch_html()
-        if html is None:
+        # Only td-cpt-post containers are processed; each is cleared once it
+        # has been read, and its earlier siblings are dropped. Other divs stay
+        # in the tree until the page has been parsed.
+        posts = self.stream_elements("div", _IS_FINSMES_POST)
+        if posts is None:
             return []
 
-        soup = BeautifulSoup(html, "html.parser")
-        containers = soup.find_all("div", class_="td-cpt-post")
         articles = []
-        for container in containers:
-            module_container = container.find(
-                "div", class_="td-module-container")
-
-            if module_container is None:
-                continue
-            article = self.parse_article(module_container)
-
-            if article is not None and article.date >= threshold_date:
-                articles.append(article)
+        with closing(posts):
+            for post in posts:
+                module_containers = _FINSMES_MODULE_CONTAINER(post)
+                if not module_containers:
+                    continue
+                module_container = module_containers[0]
+
+                # Check the date first so stale articles are never built.
+                # Every post is checked: the page may hold more than one post
+                # block, so a stale post does not mean the rest are stale.
+                art_date = self.parse_date(module_container)
+                if art_date is not None and art_date >= threshold_date:
+                    articles.append(
+                        self.parse_article(module_container, art_date))
 
         return articles
 
 
 def save_articles(articles, output_filename):
     """
-    Writes a list of Article objects (using their dictionary representation)
-    to a file.
+    Writes a list of Article objects to a file.
 
     Args:
         articles (list[Article]): List of articles to save.
         output_filename (str): The file in which to write the articles.
     """
+    blocks = []
+    for art in articles:
+        # Read the slots directly rather than building a dict per article.
+        blocks.append(
+            f"Title: {art.title}\n"
+            f"Date:  {art.date_str}\n"
+            f"Link:  {art.link}\n"
+            f"{_SEPARATOR}")
+
     try:
-        with open(output_filename, "w", encoding="utf-8") as f:
-            for art in articles:
-                art_dict = art.to_dict()
-                f.write(f"Title: {art_dict['title']}\n")
-                f.write(f"Date:  {art_dict['date']}\n")
-                f.write(f"Link:  {art_dict['link']}\n")
-                f.write("-" * 40 + "\n")
+        # Encode the whole file once and write it in a single call.
+        with open(output_filename, "wb") as f:
+            f.write("".join(blocks).encode("utf-8"))
         print(f"Saved {len(articles)} articles to '{output_filename}'.")
     except IOError as e:
-        print("Error writing to file:", e)
+        logger.warning("Error writing to file: %s", e)
 
 
 def run_scraper(threshold_date_str, output_filename="articles.txt"):
@@ -230,7 +418,9 @@ def run_scraper(threshold_date_str, output_filename="articles.txt"):
         ValueError: If the provided date string is not in the correct format.
     """
     try:
-        threshold_date = datetime.strptime(threshold_date_str, "%Y-%m-%d")
+        # Compare calendar dates so the time of day never affects filtering.
+        threshold_date = datetime.strptime(
+            threshold_date_str, "%Y-%m-%d").date()
     except ValueError as exc:
         raise ValueError(
             "Invalid date format. Please use YYYY-MM-DD.") from exc
@@ -240,16 +430,27 @@ def run_scraper(threshold_date_str, output_filename="articles.txt"):
         FinSMEsScraper("https://www.finsmes.com/category/canada")
     ]
 
+    # Scraping is I/O-bound, so run each site concurrently; one failing site
+    # must not prevent the others from being saved.
     all_articles = []
-    for scraper in scrapers:
-        articles = scraper.scrape(threshold_date)
-        all_articles.extend(articles)
+    with ThreadPoolExecutor(max_workers=len(scrapers)) as executor:
+        futures = {
+            executor.submit(scraper.scrape, threshold_date): scraper
+            for scraper in scrapers
+        }
+        for future in as_completed(futures):
+            try:
+                all_articles.extend(future.result())
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.warning("Error scraping %s: %s", futures[future].url, e)
 
     save_articles(all_articles, output_filename)
     return all_articles
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
     if len(sys.argv) < 2:
         print("Usage: python 'article_scraper.py' <threshold_date (YYYY-MM-DD)>")
         sys.exit(1)
@@ -15,11 +15,34 @@ TOKEN_URI = "https://oauth2.googleapis.com/token"
 # Define the scope(s) your application needs.
 SCOPES = "https://www.googleapis.com/auth/spreadsheets"
 
+# An existing JWT is reused while it remains valid for at least this many seconds.
+JWT_REUSE_MARGIN = 300
+
+
+def _load_valid_jwt(filename, client_email):
+    """
+    Returns the JWT stored in filename if it was issued by client_email for
+    SCOPES and does not expire within JWT_REUSE_MARGIN seconds, otherwise None.
+    """
+    try:
+        with open(filename, "r", encoding="utf-8") as f:
+            jwt_token = f.read().strip()
+        claims = jwt.decode(jwt_token, options={"verify_signature": False})
+        if (claims["iss"] == client_email and claims["scope"] == SCOPES
+                and claims["exp"] > time.time() + JWT_REUSE_MARGIN):
+            return jwt_token
+    except (OSError, jwt.PyJWTError, KeyError, TypeError):
+        pass
+    return None
+
 
 def generate_jwt(output_filename="jwt.txt"):
     """
     Generates a JWT token based on the service account credentials and saves it to a file.
 
+    If the file already holds a JWT that is still valid and was issued for the
+    current service account and scopes, it is returned as is.
+
     Args:
         output_filename (str): Path to the file where the JWT token will be saved.
 
@@ -40,6 +63,11 @@ def generate_jwt(output_filename="jwt.txt"):
     private_key = service_account_info['private_key']
     client_email = service_account_info['client_email']
 
+    jwt_token = _load_valid_jwt(output_filename, client_email)
+    if jwt_token:
+        print(f"Reusing unexpired JWT from file: {output_filename}.")
+        return jwt_token
+
     # Get the current time and set the token's expiration (1 hour from now).
     now = int(time.time())
     expires_in = 3600  # Token valid for 1 hour
@@ -0,0 +1,47 @@
+"""
+Module for creating the pooled HTTP sessions shared by the other modules.
+"""
+
+import requests
+import requests_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def create_session(headers=None, cache_name=None):
+    """
+    Creates a requests session that keeps connections alive between calls
+    and retries transient failures with exponential backoff.
+
+    Args:
+        headers (dict): Optional default headers sent with every request.
+        cache_name (str): Optional SQLite file in which responses are cached
+            for 30 minutes (or as allowed by their Cache-Control headers).
+            Stale entries are revalidated with ETag/Last-Modified and reused
+            if the server errors.
+
+    Returns:
+        requests.Session: The configured session.
+    """
+    if cache_name:
+        session = requests_cache.CachedSession(
+            cache_name,
+            backend="sqlite",
+            expire_after=1800,
+            cache_control=True,
+            stale_if_error=True)
+    else:
+        session = requests.Session()
+    if headers:
+        session.headers.update(headers)
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504]))
+    # Mount for both schemes so plain-http sites also get pooling and retries.
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
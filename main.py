@@ -3,10 +3,30 @@ Main module for the Article Scraper Utility.
 
 This script runs the article scraper, JWT generator, and appends articles to Google Sheets.
 """
+import logging
 import sys
+from concurrent.futures import ThreadPoolExecutor
+import requests
 from article_scraper import run_scraper
 from generate_jwt import generate_jwt
-from append_articles_in_google_sheets import run_append_articles
+from append_articles_in_google_sheets import get_access_token, run_append_articles
+
+
+def authenticate():
+    """
+    Generates the JWT and exchanges it for a Google Sheets access token.
+
+    Returns:
+        str: The obtained access token.
+
+    Raises:
+        IOError: If the JWT cannot be generated.
+        requests.RequestException: If the token endpoint cannot be reached.
+        RuntimeError: If the token exchange fails.
+    """
+    print("\nRunning JWT generator ...")
+    generate_jwt()
+    return get_access_token()
 
 
 def main(date_filter):
@@ -17,23 +37,34 @@ def main(date_filter):
         filter_date (str): Date in YYYY-MM-DD format; only articles on or after
         this date are processed.
     """
-    try:
-        print("Running article scraper ...")
-        run_scraper(date_filter)
-    except RuntimeError as e:
-        print(f"Error running article scraper: {e}")
-        sys.exit(1)
+    # Authentication does not depend on the scraped articles, so its network
+    # round-trips run while the scraper is still fetching pages.
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        token_future = executor.submit(authenticate)
 
-    try:
-        print("\nRunning JWT generator ...")
-        generate_jwt()
-    except (RuntimeError, IOError) as e:
-        print(f"Error generating JWT: {e}")
-        sys.exit(1)
+        try:
+            print("Running article scraper ...")
+            run_scraper(date_filter)
+        except RuntimeError as e:
+            print(f"Error running article scraper: {e}")
+            sys.exit(1)
+
+        try:
+            access_token = token_future.result()
+        # RequestException subclasses IOError, so it must be caught first.
+        except requests.RequestException as e:
+            print(f"Error exchanging JWT for access token: {e}")
+            sys.exit(1)
+        except IOError as e:
+            print(f"Error generating JWT: {e}")
+            sys.exit(1)
+        except RuntimeError as e:
+            print(f"Error obtaining access token: {e}")
+            sys.exit(1)
 
     try:
         print("\nAppending articles to Google Sheets ...")
-        run_append_articles()
+        run_append_articles(access_token)
     except RuntimeError as e:
         print(f"Error appending articles to Google Sheets: {e}")
         sys.exit(1)
@@ -42,6 +73,8 @@ def main(date_filter):
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
     # Only fetch articles on or after this date
     DATE_FILTER = "2025-04-10" # April 10, 2025
 
@@ -0,0 +1,114 @@
+"""
+Tests for append_articles_in_google_sheets.
+"""
+
+import json
+import os
+import tempfile
+import time
+import unittest
+from datetime import datetime
+from unittest import mock
+
+import append_articles_in_google_sheets as sheets
+from append_articles_in_google_sheets import _parse_articles, load_articles
+from article_scraper import Article, save_articles
+
+SEPARATOR = b"-" * 40
+
+
+class LoadArticlesTest(unittest.TestCase):
+    """Checks that title/link pairs are read back from the articles file."""
+
+    def test_save_articles_round_trip(self):
+        """Every article written by save_articles is loaded back in order."""
+        articles = [
+            Article("First", "https://example.com/1", datetime(2025, 4, 14)),
+            Article("Second", "https://example.com/2", datetime(2025, 4, 12)),
+        ]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "articles.txt")
+            save_articles(articles, path)
+            self.assertEqual(load_articles(path), [
+                ["", "", "https://example.com/1", "First"],
+                ["", "", "https://example.com/2", "Second"],
+            ])
+
+    def test_empty_file(self):
+        """An empty file yields no rows."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "articles.txt")
+            with open(path, "wb"):
+                pass
+            self.assertEqual(load_articles(path), [])
+
+    def test_indented_fields(self):
+        """Leading whitespace before the field names is ignored."""
+        self.assertEqual(_parse_articles(b"  Title: A\n  Link: L"),
+                         [["", "", "L", "A"]])
+
+    def test_link_before_title(self):
+        """A block may list its link before its title."""
+        self.assertEqual(_parse_articles(b"Link: L\nTitle: A\n" + SEPARATOR),
+                         [["", "", "L", "A"]])
+
+    def test_crlf_line_endings(self):
+        """Carriage returns are stripped from the values."""
+        self.assertEqual(
+            _parse_articles(b"Title: A\r\nDate: 2025-04-14\r\nLink: L\r\n"
+                            + SEPARATOR),
+            [["", "", "L", "A"]])
+
+    def test_block_without_link(self):
+        """A block with no link is skipped, not paired with the next link."""
+        self.assertEqual(
+            _parse_articles(b"Title: A\n" + SEPARATOR
+                            + b"\nTitle: B\nLink: L\n" + SEPARATOR),
+            [["", "", "L", "B"]])
+
+
+def _response(status_code, body):
+    """Returns a stand-in for a requests.Response with the given JSON body."""
+    return mock.Mock(status_code=status_code, content=json.dumps(body).encode(),
+                     text=json.dumps(body))
+
+
+class RejectedTokenTest(unittest.TestCase):
+    """Checks that a rejected cached token is replaced rather than reused."""
+
+    def setUp(self):
+        self.prev_dir = os.getcwd()
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        os.chdir(self.tmp_dir.name)
+        with open("jwt.txt", "w", encoding="utf-8") as f:
+            f.write("jwt")
+        with open("token_cache.json", "w", encoding="utf-8") as f:
+            json.dump({"access_token": "revoked", "exp": time.time() + 3600}, f)
+        with open("articles.txt", "w", encoding="utf-8") as f:
+            f.write("Title: A\nLink: L\n" + "-" * 40)
+
+    def tearDown(self):
+        os.chdir(self.prev_dir)
+        self.tmp_dir.cleanup()
+
+    def test_rejected_token_is_refreshed_once(self):
+        """A 401 drops the cached token and retries with a new one."""
+        post = mock.Mock(side_effect=[
+            _response(401, {"error": "unauthorized"}),
+            _response(200, {"access_token": "fresh", "expires_in": 3600}),
+            _response(200, {"updates": {}}),
+        ])
+        session = sheets._SESSION  # pylint: disable=protected-access
+        with mock.patch.object(session, "post", post), \
+                mock.patch.multiple(sheets, SPREADSHEET_ID="id",
+                                    SPREADSHEET_SHEET_NAME="Sheet1",
+                                    SPREADSHEET_CELL_RANGE="A1"):
+            self.assertEqual(sheets.run_append_articles(), {"updates": {}})
+
+        auth = [c.kwargs["headers"].get("Authorization") for c in post.call_args_list]
+        self.assertEqual(auth, ["Bearer revoked", None, "Bearer fresh"])
+        self.assertEqual(sheets.get_access_token(), "fresh")
+
+
+if __name__ == "__main__":
+    unittest.main()
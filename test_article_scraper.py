@@ -0,0 +1,152 @@
+"""
+Tests for article_scraper.
+"""
+
+import copy
+import gzip
+import os
+import pickle
+import tempfile
+import threading
+import unittest
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from article_scraper import (
+    Article, BetaKitScraper, FinSMEsScraper, _declared_encoding)
+from http_session import create_session
+
+BETAKIT_PAGE = (
+    b'<html><head><meta charset="utf-8"></head><body>'
+    b'<section class="section__latest-posts">'
+    b'<article><span class="entry-date">April 14, 2025</span>'
+    b'<h2 class="entry-title"><a href="/a">Fresh A</a></h2></article>'
+    b'<article><span class="entry-date">April 12, 2025</span>'
+    b'<h2 class="entry-title"><a href="/b">Fresh B</a></h2></article>'
+    b'<article><span class="entry-date">April 1, 2025</span>'
+    b'<h2 class="entry-title"><a href="/old">Stale</a></h2></article>'
+    # Padding after the stale article makes the page span many reads.
+    + b'<article><span class="entry-date">March 1, 2025</span></article>' * 3000
+    + b'</section></body></html>'
+)
+
+
+
+def _finsmes_post(day, link):
+    """Returns a FinSMEs td-cpt-post block dated 2025-04-<day>."""
+    return (
+        f'<div class="td-cpt-post"><div class="td-module-container">'
+        f'<time class="entry-date" datetime="2025-04-{day:02d}T08:00:00+00:00">'
+        f'</time><h3 class="entry-title"><a href="{link}">Post</a></h3>'
+        f'</div></div>').encode()
+
+
+# A featured strip with an old post precedes the newest-first main list.
+FINSMES_PAGE = (
+    b'<html><head><meta charset="utf-8"></head><body>'
+    b'<div class="featured">' + _finsmes_post(14, "/featured")
+    + _finsmes_post(1, "/featured-old") + b'</div>'
+    b'<div class="main">' + _finsmes_post(13, "/c") + _finsmes_post(11, "/d")
+    + _finsmes_post(2, "/old") + b'</div></body></html>'
+)
+
+
+class ArticleTest(unittest.TestCase):
+    """Checks that the frozen, slotted Article still copies and pickles."""
+
+    def test_copy_and_pickle(self):
+        """copy, deepcopy, and pickle all restore every slot."""
+        article = Article("Title", "https://example.com", date(2025, 4, 14))
+        for restored in (copy.copy(article), copy.deepcopy(article),
+                         pickle.loads(pickle.dumps(article))):
+            self.assertEqual(restored, article)
+            self.assertEqual(restored.to_dict(), article.to_dict())
+
+
+class DeclaredEncodingTest(unittest.TestCase):
+    """Checks which Content-Type charsets are handed to lxml."""
+
+    @staticmethod
+    def declared(content_type, encoding):
+        """Returns _declared_encoding for a response with these headers."""
+        return _declared_encoding(
+            mock.Mock(headers={"Content-Type": content_type}, encoding=encoding))
+
+    def test_known_charset(self):
+        """A charset lxml knows is passed through."""
+        self.assertEqual(self.declared("text/html; charset=UTF-8", "UTF-8"), "UTF-8")
+
+    def test_unknown_charset(self):
+        """An unknown charset falls back to the page's own declaration."""
+        self.assertIsNone(self.declared("text/html; charset=utf8mb4", "utf8mb4"))
+
+    def test_missing_charset(self):
+        """Without a charset, requests' ISO-8859-1 default is ignored."""
+        self.assertIsNone(self.declared("text/html", "ISO-8859-1"))
+
+
+class _GzipHandler(BaseHTTPRequestHandler):
+    """Serves the test pages gzip-encoded, as real listing pages are."""
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Responds with the gzip-compressed page for the requested path."""
+        page = FINSMES_PAGE if self.path == "/finsmes" else BETAKIT_PAGE
+        body = gzip.compress(page)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        """Keeps the test output quiet."""
+
+
+class StreamedScraperTest(unittest.TestCase):
+    """Checks that streamed scraping works with and without the response cache."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _GzipHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}/"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def scrape(self, session):
+        """Scrapes the test page with session, returning the article links."""
+        scraper = BetaKitScraper(self.url)
+        scraper.session = session
+        return [art.link for art in scraper.scrape(date(2025, 4, 10))]
+
+    def test_gzip_page_without_cache(self):
+        """A plain session streams and decodes the gzip body."""
+        self.assertEqual(self.scrape(create_session()), ["/a", "/b"])
+
+    def test_finsmes_scans_every_post_block(self):
+        """A stale post in one block does not hide fresh posts in the next."""
+        scraper = FinSMEsScraper(self.url + "finsmes")
+        scraper.session = create_session()
+        self.assertEqual(
+            [art.link for art in scraper.scrape(date(2025, 4, 10))],
+            ["/featured", "/c", "/d"])
+
+    def test_gzip_page_cache_miss_and_hit(self):
+        """A cached session returns the articles on both a miss and a hit."""
+        with tempfile.TemporaryDirectory() as cache_dir:
+            session = create_session(
+                cache_name=os.path.join(cache_dir, "cache.sqlite"))
+            try:
+                self.assertEqual(self.scrape(session), ["/a", "/b"])
+                self.assertEqual(self.scrape(session), ["/a", "/b"])
+            finally:
+                session.close()
+
+
+if __name__ == "__main__":
+    unittest.main()